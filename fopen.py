@@ -10,36 +10,80 @@ import subprocess
 import argparse
 import mimetypes
 from pathlib import Path
-import shutil
 import signal
+import shlex
+from functools import cache
+
+@cache
+def _path_binaries():
+    """Scan each $PATH directory once and collect every executable name
+
+    One readdir per directory replaces the per-command PATH walk that
+    shutil.which would repeat for every binary we probe.
+    """
+    binaries = set()
+    for path_dir in os.environ.get('PATH', '').split(os.pathsep):
+        try:
+            with os.scandir(path_dir) as entries:
+                for entry in entries:
+                    if entry.name not in binaries and os.access(entry.path, os.X_OK):
+                        binaries.add(entry.name)
+        except OSError:
+            continue
+    return frozenset(binaries)
 
 def check_command(cmd):
-    """Check if a command exists in PATH"""
-    return shutil.which(cmd) is not None
+    """Check if a command exists in PATH (single cached scan)"""
+    return cmd in _path_binaries()
+
+# Reuse a single libmagic handle across calls when python-magic is
+# installed, so the magic database is parsed once per process instead
+# of once per file(1) fork
+try:
+    import magic
+    _MAGIC = magic.Magic(mime=True)
+except Exception:
+    _MAGIC = None
 
 def get_file_mime_type(filepath):
     """Get MIME type of a file"""
+    # Fast path: known extensions don't need content-based detection
+    mime_type, _ = mimetypes.guess_type(filepath)
+    if mime_type:
+        return mime_type
+
+    if _MAGIC is not None:
+        try:
+            return _MAGIC.from_file(filepath)
+        except Exception:
+            pass
+
     try:
-        result = subprocess.run(['file', '--brief', '--mime-type', '--', filepath], 
-                              capture_output=True, text=True)
-        return result.stdout.strip()
+        # Raw bytes: skip the text-mode decode machinery and the stderr
+        # pipe for the ~20 bytes file(1) prints
+        result = subprocess.run(['file', '--brief', '--mime-type', '--', filepath],
+                              stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+                              close_fds=False)
+        return result.stdout.strip().decode('ascii', 'replace')
     except:
-        # Fallback to Python's mimetypes
-        mime_type, _ = mimetypes.guess_type(filepath)
-        return mime_type or 'application/octet-stream'
+        return 'application/octet-stream'
 
 def build_find_command(show_hidden=False):
-    """Build the find command based on available tools"""
+    """Build the find command; returns (argv list, shell-quoted string)
+
+    The string form is what the fzf reload bindings embed, quoted with
+    shlex.join so find's parentheses and globs survive the shell.
+    """
     if check_command('fd'):
         if show_hidden:
-            return [
+            cmd = [
                 'fd', '-t', 'f', '-t', 'd', '--strip-cwd-prefix', '--color=never',
                 '--hidden', '--follow', '--exclude', '.git', '--exclude', 'node_modules',
                 '--exclude', '.vscode', '--exclude', '.idea', '--exclude', 'dist',
                 '--exclude', 'build', '--exclude', 'target', '--exclude', '.cache', '-0'
             ]
         else:
-            return [
+            cmd = [
                 'fd', '-t', 'f', '-t', 'd', '--strip-cwd-prefix', '--color=never',
                 '--exclude', 'node_modules', '--exclude', '.vscode', '--exclude', '.idea',
                 '--exclude', 'dist', '--exclude', 'build', '--exclude', 'target',
@@ -48,24 +92,56 @@ def build_find_command(show_hidden=False):
     else:
         # Fallback to find
         if show_hidden:
-            return [
+            cmd = [
                 'find', '.', '(', '-path', '*/.git', '-o', '-path', '*/node_modules',
                 '-o', '-path', '*/.vscode', '-o', '-path', '*/.idea', '-o', '-path', '*/dist',
                 '-o', '-path', '*/build', '-o', '-path', '*/target', '-o', '-path', '*/.cache',
-                ')', '-prune', '-o', '-type', 'f', '-print0', '-o', '-type', 'd', '-print0'
+                ')', '-prune', '-o', '-type', 'f', '-print0', '-o', '-type', 'd',
+                '-printf', '%p/\\0'
             ]
         else:
-            return [
+            cmd = [
                 'find', '.', '(', '-path', '*/.git', '-o', '-path', '*/node_modules',
                 '-o', '-path', '*/.vscode', '-o', '-path', '*/.idea', '-o', '-path', '*/dist',
                 '-o', '-path', '*/build', '-o', '-path', '*/target', '-o', '-path', '*/.cache',
                 '-o', '-path', '*/.*', ')', '-prune', '-o', '-type', 'f', '-print0',
-                '-o', '-type', 'd', '-print0'
+                '-o', '-type', 'd', '-printf', '%p/\\0'
             ]
+    return cmd, shlex.join(cmd)
+
+@cache
+def fzf_supports_walker():
+    """Check if fzf is new enough (>= 0.42) for built-in --walker traversal"""
+    try:
+        output = subprocess.run(['fzf', '--version'], stdout=subprocess.PIPE,
+                              text=True, close_fds=False).stdout
+        major, minor = output.split()[0].split('.')[:2]
+        return (int(major), int(minor)) >= (0, 42)
+    except Exception:
+        return False
+
+def build_walker_flags(show_hidden=False):
+    """Build fzf --walker flags for in-process directory traversal"""
+    walker = 'file,dir,hidden,follow' if show_hidden else 'file,dir'
+    skip = '.git,node_modules,.vscode,.idea,dist,build,target,.cache'
+    return [f'--walker={walker}', f'--walker-skip={skip}']
 
-def create_preview_command(filepath):
-    """Create preview command for fzf"""
-    return f"""test -d "{filepath}" && {{ ls -A "{filepath}" | head -n 50; }} || {{ file --mime-type -b "{filepath}" | grep -qiF -e 'text' -e 'json' -e 'javascript' && bat --style=numbers --color=always --paging=never "{filepath}" || file --brief "{filepath}"; }}"""
+def build_preview_command():
+    """Build the fzf preview command with an extension fast path
+
+    Known text extensions jump straight to bat, so the preview doesn't
+    fork file(1) on every highlighted entry; unknown extensions keep
+    the MIME sniff as fallback.
+    """
+    text_globs = '|'.join(f'*{ext}' for ext, cat in _EXT_CATEGORY.items()
+                          if cat == 'text')
+    bat_cmd = 'bat --style=numbers --color=always --paging=never {}'
+    return (
+        'test -d {} && { ls -A {} | head -n 50; } || '
+        'case {} in ' + text_globs + ') ' + bat_cmd + ' ;; '
+        '*) file --mime-type -b {} | grep -qiF -e "text" -e "json" -e "javascript" && '
+        + bat_cmd + ' || file --brief {} ;; esac'
+    )
 
 def choose_app_option(options):
     """Interactive option selection"""
@@ -78,7 +154,8 @@ def choose_app_option(options):
         try:
             options_str = '\n'.join([f"{opt[0]} :: {opt[1]}" for opt in options])
             result = subprocess.run(['fzf', '--prompt=Open with: ', '--height=40%', '--reverse'],
-                                  input=options_str, text=True, capture_output=True)
+                                  input=options_str, text=True, capture_output=True,
+                                  close_fds=False)
             if result.returncode == 0:
                 selected = result.stdout.strip()
                 if selected:
@@ -107,9 +184,10 @@ def run_detached(cmd):
     """Run command detached from terminal"""
     try:
         subprocess.Popen(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
-                        preexec_fn=os.setpgrp)
+                        start_new_session=True, close_fds=False)
     except:
-        subprocess.Popen(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        subprocess.Popen(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                        close_fds=False)
 
 def handle_directory(dirpath):
     """Handle directory selection"""
@@ -139,17 +217,42 @@ def handle_directory(dirpath):
     elif editor == "nautilus":
         run_detached(['nautilus', dirpath])
     elif editor == "nvim":
-        subprocess.run(['nvim', dirpath])
+        subprocess.run(['nvim', dirpath], close_fds=False)
+
+# Extension -> category fast path: unambiguous extensions skip MIME
+# detection (and the file(1) fork) entirely
+_EXT_CATEGORY = {
+    # Text
+    '.py': 'text', '.json': 'text', '.md': 'text', '.txt': 'text',
+    '.sh': 'text', '.yml': 'text', '.yaml': 'text', '.toml': 'text',
+    '.ini': 'text', '.cfg': 'text', '.conf': 'text', '.xml': 'text',
+    '.html': 'text', '.css': 'text', '.js': 'text', '.ts': 'text',
+    '.c': 'text', '.h': 'text', '.cpp': 'text', '.rs': 'text', '.go': 'text',
+    # Images
+    '.png': 'image', '.jpg': 'image', '.jpeg': 'image', '.gif': 'image',
+    '.webp': 'image', '.svg': 'image', '.bmp': 'image',
+    # PDF
+    '.pdf': 'pdf',
+}
 
 def handle_file(filepath):
-    """Handle file selection based on MIME type"""
-    mime_type = get_file_mime_type(filepath)
-    
+    """Handle file selection based on extension or MIME type"""
+    ext = os.path.splitext(filepath)[1].lower()
+    category = _EXT_CATEGORY.get(ext)
+
+    if category is None:
+        mime_type = get_file_mime_type(filepath)
+        if (mime_type.startswith('text/') or
+            mime_type in ['application/json', 'application/xml', 'application/javascript',
+                         'application/x-yaml', 'application/x-shellscript', 'inode/x-empty']):
+            category = 'text'
+        elif mime_type.startswith('image/'):
+            category = 'image'
+        elif mime_type == 'application/pdf':
+            category = 'pdf'
+
     # Text files
-    if (mime_type.startswith('text/') or 
-        mime_type in ['application/json', 'application/xml', 'application/javascript',
-                     'application/x-yaml', 'application/x-shellscript', 'inode/x-empty']):
-        
+    if category == 'text':
         options = [
             ("nvim", "Open in terminal"),
             ("code", "Visual Studio Code"),
@@ -169,7 +272,7 @@ def handle_file(filepath):
             return
         
         if editor == "nvim":
-            subprocess.run(['nvim', '--', filepath])
+            subprocess.run(['nvim', '--', filepath], close_fds=False)
         elif editor == "code":
             run_detached(['code', '--reuse-window', '--', filepath])
         elif editor == "gedit":
@@ -178,14 +281,14 @@ def handle_file(filepath):
             run_detached(['kate', '--', filepath])
         else:
             # Fallback to vim
-            subprocess.run(['vim', '--', filepath])
+            subprocess.run(['vim', '--', filepath], close_fds=False)
     
     # Image files
-    elif mime_type.startswith('image/'):
+    elif category == 'image':
         run_detached(['loupe', '--', filepath])
-    
+
     # PDF files
-    elif mime_type == 'application/pdf':
+    elif category == 'pdf':
         run_detached(['okular', '--', filepath])
     
     # Fallback to xdg-open
@@ -212,11 +315,16 @@ def main():
         print("Error: fzf is required but not found in PATH", file=sys.stderr)
         sys.exit(1)
     
-    # Build find command
-    find_cmd = build_find_command(show_hidden)
-    hidden_find_cmd = build_find_command(True)
-    base_find_cmd = build_find_command(False)
-    
+    # Build each find command once; the reload bindings reuse the
+    # pre-quoted strings and the current mode picks its argv list
+    hidden_find_cmd, hidden_find_str = build_find_command(True)
+    base_find_cmd, base_find_str = build_find_command(False)
+    find_cmd = hidden_find_cmd if show_hidden else base_find_cmd
+
+    # Without fd, let a recent fzf walk the tree in-process instead of
+    # spawning find and copying everything through a pipe
+    use_walker = not check_command('fd') and fzf_supports_walker()
+
     # Set up headers and commands
     header = 'Hidden: ON   (Alt-h on / Alt-H off)' if show_hidden else 'Hidden: OFF  (Alt-h on / Alt-H off)'
     
@@ -227,26 +335,46 @@ def main():
         '--height=90%',
         '--border',
         f'--header={header}',
-        '--preview=' + 'test -d {} && { ls -A {} | head -n 50; } || { file --mime-type -b {} | grep -qiF -e "text" -e "json" -e "javascript" && bat --style=numbers --color=always --paging=never {} || file --brief {}; }',
-        '--bind=alt-h:reload(' + ' '.join(hidden_find_cmd) + ')+change-header(Hidden: ON   (Alt-h on / Alt-H off))',
-        '--bind=alt-H:reload(' + ' '.join(base_find_cmd) + ')+change-header(Hidden: OFF  (Alt-h on / Alt-H off))'
+        '--preview=' + build_preview_command(),
+        '--bind=alt-h:reload(' + hidden_find_str + ')+change-header(Hidden: ON   (Alt-h on / Alt-H off))',
+        '--bind=alt-H:reload(' + base_find_str + ')+change-header(Hidden: OFF  (Alt-h on / Alt-H off))'
     ]
-    
+
+    if use_walker:
+        fzf_cmd.extend(build_walker_flags(show_hidden))
+
     try:
-        # Run find command and pipe to fzf
-        find_process = subprocess.Popen(find_cmd, stdout=subprocess.PIPE)
-        fzf_process = subprocess.Popen(fzf_cmd, stdin=find_process.stdout, 
-                                     stdout=subprocess.PIPE, text=True)
-        find_process.stdout.close()
-        
-        selected_file, _ = fzf_process.communicate()
-        selected_file = selected_file.strip()
+        if use_walker:
+            # fzf traverses directly; no find subprocess or pipe needed
+            result = subprocess.run(fzf_cmd, stdout=subprocess.PIPE, text=True,
+                                  close_fds=False)
+            selected_file = result.stdout.strip()
+        else:
+            # Run find command and pipe to fzf
+            find_process = subprocess.Popen(find_cmd, stdout=subprocess.PIPE,
+                                          close_fds=False)
+            fzf_process = subprocess.Popen(fzf_cmd, stdin=find_process.stdout,
+                                         stdout=subprocess.PIPE, text=True, close_fds=False)
+            find_process.stdout.close()
+
+            # Only one line is expected, so read it directly instead of
+            # buffering everything through communicate(), then reap both
+            # processes (fzf exiting early kills find via SIGPIPE)
+            selected_file = fzf_process.stdout.readline().rstrip('\n')
+            fzf_process.stdout.close()
+            fzf_process.wait()
+            find_process.terminate()
+            find_process.wait()
         
         if not selected_file:
             return
         
-        # Handle selection
-        if os.path.isdir(selected_file):
+        # Handle selection: fd and the find fallback mark directories
+        # with a trailing slash, so no extra stat is needed; the walker
+        # path doesn't encode the type and still checks
+        if selected_file.endswith('/'):
+            handle_directory(selected_file)
+        elif use_walker and os.path.isdir(selected_file):
             handle_directory(selected_file)
         else:
             handle_file(selected_file)
@@ -7,12 +7,10 @@ A cross-shell file picker with smart application selection
 import os
 import sys
 import subprocess
-import argparse
-import mimetypes
-from pathlib import Path
-import shutil
-import signal
-import json
+from functools import cache
+
+# argparse, json, mimetypes and pathlib are imported lazily inside the
+# functions that need them to keep interactive startup fast
 
 class FopenConfig:
     """Fopen configuration manager"""
@@ -20,14 +18,17 @@ class FopenConfig:
     def __init__(self):
         self.config_path = self._get_config_path()
         self.config = self._load_config()
+        self._available_apps = {}
         
     def _get_config_path(self):
         """Get configuration file path"""
+        from pathlib import Path
+
         # Try XDG_CONFIG_HOME first
         config_home = os.environ.get('XDG_CONFIG_HOME')
         if config_home:
             return Path(config_home) / 'fopen' / 'config.json'
-        
+
         # Fallback to ~/.config
         home = Path.home()
         return home / '.config' / 'fopen' / 'config.json'
@@ -83,15 +84,30 @@ class FopenConfig:
         # Apply environment variable overrides
         self._apply_env_overrides(config)
         
-        # Load from file if it exists
-        if self.config_path.exists():
+        # Load from file if it exists. Checking the parent dir fails
+        # fast on fresh systems with no ~/.config/fopen at all, and
+        # opening directly (catching FileNotFoundError) avoids the
+        # exists()+open() stat pair and its race
+        if self.config_path.parent.is_dir():
+            import json
             try:
                 with open(self.config_path, 'r') as f:
                     file_config = json.load(f)
                     self._merge_config(config, file_config)
+            except FileNotFoundError:
+                pass
             except Exception as e:
                 print(f"Warning: Could not load config file: {e}", file=sys.stderr)
-        
+
+        # Precompute MIME matchers: a tuple lets str.startswith test all
+        # prefixes in one C-level call, and exact types become set lookups
+        file_types = config['file_types']
+        self.text_prefixes = tuple(p for p in file_types['text'] if p.endswith('/'))
+        self.text_exact = frozenset(p for p in file_types['text'] if not p.endswith('/'))
+        self.image_prefixes = tuple(p for p in file_types['images'] if p.endswith('/'))
+        self.image_exact = frozenset(p for p in file_types['images'] if not p.endswith('/'))
+        self.pdf_exact = frozenset(file_types['pdf'])
+
         return config
     
     def _apply_env_overrides(self, config):
@@ -118,25 +134,37 @@ class FopenConfig:
         if exclude_dirs:
             config['search']['excluded_dirs'] = exclude_dirs.split(':')
     
+    # Top-level sections that hold nested dicts in the default config
+    _DICT_SECTIONS = ('applications', 'file_types', 'search', 'interface')
+
     def _merge_config(self, base, override):
-        """Merge configurations recursively"""
+        """Merge an override config into the defaults.
+
+        The config shape is fixed at two levels (section -> key), so a
+        flat per-section dict.update is all that's needed; deeper
+        nesting is not supported.
+        """
         for key, value in override.items():
-            if key in base and isinstance(base[key], dict) and isinstance(value, dict):
-                self._merge_config(base[key], value)
+            if key in self._DICT_SECTIONS and isinstance(value, dict):
+                base[key].update(value)
             else:
                 base[key] = value
     
     def get_available_apps(self, category):
-        """Get available applications for a category"""
+        """Get available applications for a category (memoized per category)"""
+        if category in self._available_apps:
+            return self._available_apps[category]
+
         apps = self.config['applications'].get(category, [])
         available = []
-        
+
         for app in apps:
             if check_command(app['command']):
                 available.append(app)
-        
+
         # Sort by priority
         available.sort(key=lambda x: x.get('priority', 999))
+        self._available_apps[category] = available
         return available
     
     def get_excluded_dirs(self):
@@ -153,44 +181,95 @@ class FopenConfig:
     
     def create_default_config_file(self):
         """Create default configuration file"""
+        import json
+
         self.config_path.parent.mkdir(parents=True, exist_ok=True)
         with open(self.config_path, 'w') as f:
             json.dump(self._get_default_config(), f, indent=2)
         print(f"Created default config at: {self.config_path}")
 
-# Global configuration instance
-config_manager = FopenConfig()
+@cache
+def get_config():
+    """Global configuration instance, constructed on first use"""
+    return FopenConfig()
+
+@cache
+def _path_binaries():
+    """Scan each $PATH directory once and collect every executable name
+
+    One readdir per directory replaces the per-command PATH walk that
+    shutil.which would repeat for every binary we probe.
+    """
+    binaries = set()
+    for path_dir in os.environ.get('PATH', '').split(os.pathsep):
+        try:
+            with os.scandir(path_dir) as entries:
+                for entry in entries:
+                    if entry.name not in binaries and os.access(entry.path, os.X_OK):
+                        binaries.add(entry.name)
+        except OSError:
+            continue
+    return frozenset(binaries)
 
 def check_command(cmd):
-    """Check if a command exists in PATH"""
-    return shutil.which(cmd) is not None
+    """Check if a command exists in PATH (single cached scan)"""
+    return cmd in _path_binaries()
+
+# Reuse a single libmagic handle across calls when python-magic is
+# installed, so the magic database is parsed once per process instead
+# of once per file(1) fork
+try:
+    import magic
+    _MAGIC = magic.Magic(mime=True)
+except Exception:
+    _MAGIC = None
 
 def get_file_mime_type(filepath):
     """Get MIME type of a file"""
+    import mimetypes
+
+    # Fast path: known extensions don't need content-based detection
+    mime_type, _ = mimetypes.guess_type(filepath)
+    if mime_type:
+        return mime_type
+
+    if _MAGIC is not None:
+        try:
+            return _MAGIC.from_file(filepath)
+        except Exception:
+            pass
+
     try:
-        result = subprocess.run(['file', '--brief', '--mime-type', '--', filepath], 
-                              capture_output=True, text=True)
-        return result.stdout.strip()
+        # Raw bytes: skip the text-mode decode machinery and the stderr
+        # pipe for the ~20 bytes file(1) prints
+        result = subprocess.run(['file', '--brief', '--mime-type', '--', filepath],
+                              stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+                              close_fds=False)
+        return result.stdout.strip().decode('ascii', 'replace')
     except:
-        # Fallback to Python's mimetypes
-        mime_type, _ = mimetypes.guess_type(filepath)
-        return mime_type or 'application/octet-stream'
+        return 'application/octet-stream'
 
 def build_find_command(show_hidden=False):
-    """Build the find command based on available tools"""
+    """Build the find command; returns (argv list, shell-quoted string)
+
+    The string form is what the fzf reload bindings embed, quoted with
+    shlex.join so find's parentheses and globs survive the shell.
+    """
+    import shlex
+
+    config_manager = get_config()
     excluded_dirs = config_manager.get_excluded_dirs()
-    
+
     if config_manager.should_use_fd() and check_command('fd'):
         cmd = ['fd', '-t', 'f', '-t', 'd', '--strip-cwd-prefix', '--color=never']
-        
+
         if show_hidden:
             cmd.extend(['--hidden', '--follow'])
-        
+
         for exclude_dir in excluded_dirs:
             cmd.extend(['--exclude', exclude_dir])
-        
+
         cmd.append('-0')
-        return cmd
     else:
         # Fallback to find
         cmd = ['find', '.']
@@ -213,8 +292,44 @@ def build_find_command(show_hidden=False):
         if not show_hidden:
             cmd.extend(['-path', '*/.*', '-prune', '-o'])
         
-        cmd.extend(['-type', 'f', '-print0', '-o', '-type', 'd', '-print0'])
-        return cmd
+        cmd.extend(['-type', 'f', '-print0', '-o', '-type', 'd',
+                    '-printf', '%p/\\0'])
+
+    return cmd, shlex.join(cmd)
+
+@cache
+def fzf_supports_walker():
+    """Check if fzf is new enough (>= 0.42) for built-in --walker traversal"""
+    try:
+        output = subprocess.run(['fzf', '--version'], stdout=subprocess.PIPE,
+                              text=True, close_fds=False).stdout
+        major, minor = output.split()[0].split('.')[:2]
+        return (int(major), int(minor)) >= (0, 42)
+    except Exception:
+        return False
+
+def build_walker_flags(show_hidden=False):
+    """Build fzf --walker flags for in-process directory traversal"""
+    walker = 'file,dir,hidden,follow' if show_hidden else 'file,dir'
+    skip = ','.join(get_config().get_excluded_dirs())
+    return [f'--walker={walker}', f'--walker-skip={skip}']
+
+def build_preview_command():
+    """Build the fzf preview command with an extension fast path
+
+    Known text extensions jump straight to bat, so the preview doesn't
+    fork file(1) on every highlighted entry; unknown extensions keep
+    the MIME sniff as fallback.
+    """
+    text_globs = '|'.join(f'*{ext}' for ext, cat in _EXT_CATEGORY.items()
+                          if cat == 'text')
+    bat_cmd = 'bat --style=numbers --color=always --paging=never {}'
+    return (
+        'test -d {} && { ls -A {} | head -n 50; } || '
+        'case {} in ' + text_globs + ') ' + bat_cmd + ' ;; '
+        '*) file --mime-type -b {} | grep -qiF -e "text" -e "json" -e "javascript" && '
+        + bat_cmd + ' || file --brief {} ;; esac'
+    )
 
 def choose_app_option(options):
     """Interactive option selection"""
@@ -226,11 +341,12 @@ def choose_app_option(options):
     formatted_options = [(app['command'], app['label']) for app in options]
     
     # Try fzf first if configured
-    if config_manager.config['interface']['use_fzf_for_app_selection'] and check_command('fzf'):
+    if get_config().config['interface']['use_fzf_for_app_selection'] and check_command('fzf'):
         try:
             options_str = '\n'.join([f"{opt[0]} :: {opt[1]}" for opt in formatted_options])
             result = subprocess.run(['fzf', '--prompt=Open with: ', '--height=40%', '--reverse'],
-                                  input=options_str, text=True, capture_output=True)
+                                  input=options_str, text=True, capture_output=True,
+                                  close_fds=False)
             if result.returncode == 0:
                 selected = result.stdout.strip()
                 if selected:
@@ -259,9 +375,10 @@ def run_detached(cmd):
     """Run command detached from terminal"""
     try:
         subprocess.Popen(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
-                        preexec_fn=os.setpgrp)
+                        start_new_session=True, close_fds=False)
     except:
-        subprocess.Popen(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        subprocess.Popen(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                        close_fds=False)
 
 def handle_directory(dirpath):
     """Handle directory selection"""
@@ -269,6 +386,7 @@ def handle_directory(dirpath):
     cd_option = {"command": "cd", "label": "Open in terminal", "terminal": True, "priority": 0}
     
     # Obtain available file managers
+    config_manager = get_config()
     file_managers = config_manager.get_available_apps('file_managers')
     text_editors = config_manager.get_available_apps('text_editors')
     
@@ -288,28 +406,54 @@ def handle_directory(dirpath):
         for app in all_options:
             if app['command'] == app_choice:
                 if app.get('terminal', False):
-                    subprocess.run([app_choice, dirpath])
+                    subprocess.run([app_choice, dirpath], close_fds=False)
                 else:
                     run_detached([app_choice, dirpath])
                 break
 
+# Extension -> category fast path: unambiguous extensions skip MIME
+# detection (and the file(1) fork) entirely
+_EXT_CATEGORY = {
+    # Text
+    '.py': 'text', '.json': 'text', '.md': 'text', '.txt': 'text',
+    '.sh': 'text', '.yml': 'text', '.yaml': 'text', '.toml': 'text',
+    '.ini': 'text', '.cfg': 'text', '.conf': 'text', '.xml': 'text',
+    '.html': 'text', '.css': 'text', '.js': 'text', '.ts': 'text',
+    '.c': 'text', '.h': 'text', '.cpp': 'text', '.rs': 'text', '.go': 'text',
+    # Images
+    '.png': 'image', '.jpg': 'image', '.jpeg': 'image', '.gif': 'image',
+    '.webp': 'image', '.svg': 'image', '.bmp': 'image',
+    # PDF
+    '.pdf': 'pdf',
+}
+
 def handle_file(filepath):
-    """Handle file selection based on MIME type"""
-    mime_type = get_file_mime_type(filepath)
-    
-    # Determine category based on the MIME type
-    file_types = config_manager.config['file_types']
-    
-    if any(mime_type.startswith(prefix) or mime_type in file_types['text'] 
-           for prefix in file_types['text'] if prefix.endswith('/')):
-        available_apps = config_manager.get_available_apps('text_editors')
-        
-    elif any(mime_type.startswith(prefix) for prefix in file_types['images']):
-        available_apps = config_manager.get_available_apps('image_viewers')
-        
-    elif mime_type in file_types['pdf']:
-        available_apps = config_manager.get_available_apps('pdf_viewers')
-        
+    """Handle file selection based on extension or MIME type"""
+    ext = os.path.splitext(filepath)[1].lower()
+    category = _EXT_CATEGORY.get(ext)
+
+    if category is None:
+        # Unknown extension: fall back to MIME detection so
+        # config-defined file_types still apply
+        mime_type = get_file_mime_type(filepath)
+        cm = get_config()
+
+        if mime_type.startswith(cm.text_prefixes) or mime_type in cm.text_exact:
+            category = 'text'
+        elif mime_type.startswith(cm.image_prefixes) or mime_type in cm.image_exact:
+            category = 'image'
+        elif mime_type in cm.pdf_exact:
+            category = 'pdf'
+
+    if category == 'text':
+        available_apps = get_config().get_available_apps('text_editors')
+
+    elif category == 'image':
+        available_apps = get_config().get_available_apps('image_viewers')
+
+    elif category == 'pdf':
+        available_apps = get_config().get_available_apps('pdf_viewers')
+
     else:
         # Fallback to xdg-open
         run_detached(['xdg-open', '--', filepath])
@@ -328,7 +472,7 @@ def handle_file(filepath):
     for app in available_apps:
         if app['command'] == app_choice:
             if app.get('terminal', False):
-                subprocess.run([app_choice, '--', filepath])
+                subprocess.run([app_choice, '--', filepath], close_fds=False)
             else:
                 if app_choice == "code":
                     run_detached([app_choice, '--reuse-window', '--', filepath])
@@ -337,6 +481,8 @@ def handle_file(filepath):
             break
 
 def main():
+    import argparse
+
     parser = argparse.ArgumentParser(description='Fuzzy file opener', add_help=False)
     parser.add_argument('--hidden', action='store_true',
                        help='Show hidden files')
@@ -348,49 +494,78 @@ def main():
     args = parser.parse_args()
     
     if args.config:
-        config_manager.create_default_config_file()
+        # Instantiated only to write the defaults; nothing else needs it
+        FopenConfig().create_default_config_file()
+        # Config changed: drop stale PATH lookups so the next run re-scans
+        _path_binaries.cache_clear()
         return
     
     if not check_command('fzf'):
         print("Error: fzf is required but not found in PATH", file=sys.stderr)
         sys.exit(1)
     
-    # Build find command
-    find_cmd = build_find_command(args.hidden)
-    hidden_find_cmd = build_find_command(True)
-    base_find_cmd = build_find_command(False)
-    
+    # Build each find command once; the reload bindings reuse the
+    # pre-quoted strings and the current mode picks its argv list
+    hidden_find_cmd, hidden_find_str = build_find_command(True)
+    base_find_cmd, base_find_str = build_find_command(False)
+    find_cmd = hidden_find_cmd if args.hidden else base_find_cmd
+
+    # Without fd, let a recent fzf walk the tree in-process instead of
+    # spawning find and copying everything through a pipe
+    use_fd = get_config().should_use_fd() and check_command('fd')
+    use_walker = not use_fd and fzf_supports_walker()
+
     # Set up headers and commands
     header = 'Hidden: ON   (Alt-h on / Alt-H off)' if args.hidden else 'Hidden: OFF  (Alt-h on / Alt-H off)'
     
     # Create fzf command
-    fzf_height = config_manager.get_fzf_height()
+    fzf_height = get_config().get_fzf_height()
     fzf_cmd = [
         'fzf',
         '--read0',
         f'--height={fzf_height}',
         '--border',
         f'--header={header}',
-        '--preview=' + 'test -d {} && { ls -A {} | head -n 50; } || { file --mime-type -b {} | grep -qiF -e "text" -e "json" -e "javascript" && bat --style=numbers --color=always --paging=never {} || file --brief {}; }',
-        '--bind=alt-h:reload(' + ' '.join(hidden_find_cmd) + ')+change-header(Hidden: ON   (Alt-h on / Alt-H off))',
-        '--bind=alt-H:reload(' + ' '.join(base_find_cmd) + ')+change-header(Hidden: OFF  (Alt-h on / Alt-H off))'
+        '--preview=' + build_preview_command(),
+        '--bind=alt-h:reload(' + hidden_find_str + ')+change-header(Hidden: ON   (Alt-h on / Alt-H off))',
+        '--bind=alt-H:reload(' + base_find_str + ')+change-header(Hidden: OFF  (Alt-h on / Alt-H off))'
     ]
-    
+
+    if use_walker:
+        fzf_cmd.extend(build_walker_flags(args.hidden))
+
     try:
-        # Run find command and pipe to fzf
-        find_process = subprocess.Popen(find_cmd, stdout=subprocess.PIPE)
-        fzf_process = subprocess.Popen(fzf_cmd, stdin=find_process.stdout, 
-                                     stdout=subprocess.PIPE, text=True)
-        find_process.stdout.close()
-        
-        selected_file, _ = fzf_process.communicate()
-        selected_file = selected_file.strip()
+        if use_walker:
+            # fzf traverses directly; no find subprocess or pipe needed
+            result = subprocess.run(fzf_cmd, stdout=subprocess.PIPE, text=True,
+                                  close_fds=False)
+            selected_file = result.stdout.strip()
+        else:
+            # Run find command and pipe to fzf
+            find_process = subprocess.Popen(find_cmd, stdout=subprocess.PIPE,
+                                          close_fds=False)
+            fzf_process = subprocess.Popen(fzf_cmd, stdin=find_process.stdout,
+                                         stdout=subprocess.PIPE, text=True, close_fds=False)
+            find_process.stdout.close()
+
+            # Only one line is expected, so read it directly instead of
+            # buffering everything through communicate(), then reap both
+            # processes (fzf exiting early kills find via SIGPIPE)
+            selected_file = fzf_process.stdout.readline().rstrip('\n')
+            fzf_process.stdout.close()
+            fzf_process.wait()
+            find_process.terminate()
+            find_process.wait()
         
         if not selected_file:
             return
         
-        # Handle selection
-        if os.path.isdir(selected_file):
+        # Handle selection: fd and the find fallback mark directories
+        # with a trailing slash, so no extra stat is needed; the walker
+        # path doesn't encode the type and still checks
+        if selected_file.endswith('/'):
+            handle_directory(selected_file)
+        elif use_walker and os.path.isdir(selected_file):
             handle_directory(selected_file)
         else:
             handle_file(selected_file)